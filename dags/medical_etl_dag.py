@@ -10,6 +10,7 @@ from airflow.providers.cncf.kubernetes.operators.pod import KubernetesPodOperato
 from airflow.providers.amazon.aws.hooks.s3 import S3Hook
 from airflow.operators.empty import EmptyOperator
 from airflow.utils.task_group import TaskGroup
+import functools
 import yaml
 import os
 import sys
@@ -17,10 +18,14 @@ import sys
 # Add repo root to sys.path to allow importing from src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Load configuration
-config_path = os.path.join(os.path.dirname(__file__), 'config', 'pipeline_config.yaml')
-with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config', 'pipeline_config.yaml')
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> dict:
+    """Load pipeline configuration, cached per scheduler process"""
+    with open(CONFIG_PATH, 'r') as f:
+        return yaml.safe_load(f)
 
 # Default arguments
 default_args = {
@@ -39,80 +44,37 @@ S3_BUCKET = os.getenv('S3_BUCKET', 'medical-etl-data-amos1234')
 DOCKER_IMAGE = os.getenv('DOCKER_IMAGE', 'medical-etl-transform:v1')
 AWS_CONN_ID = 'aws_default'
 
+# Airflow pools capping concurrent extraction tasks per API, so backfills
+# can't exceed the published rate limits and trigger 429 retry storms.
+# Create with:
+#   airflow pools set fda_api 4 "FDA OpenFDA rate cap"
+#   airflow pools set ctgov_api 8 "ClinicalTrials.gov rate cap"
+FDA_API_POOL = 'fda_api'
+CTGOV_API_POOL = 'ctgov_api'
 
-def extract_fda_data(**context):
-    """Extract FDA drug event data"""
-    from src.extractors.fda_extractor import FDAExtractor
-    
-    execution_date = context['ds']
-    extractor = FDAExtractor()
-    
-    # Extract data
-    data = extractor.extract_drug_events(
-        start_date=execution_date,
-        end_date=execution_date,
-        limit=config['extraction']['fda_limit']
+
+def raw_s3_key(source: str, execution_date: str) -> str:
+    """Build the raw-partition S3 key for a data source and date"""
+    return (
+        f"raw/{source}/year={execution_date[:4]}"
+        f"/month={execution_date[5:7]}/day={execution_date[8:10]}/data.parquet"
     )
-    
-    # Save raw data to S3
-    #s3_hook = S3Hook(aws_conn_id=AWS_CONN_ID)
-    #s3_key = f"raw/fda/year={execution_date[:4]}/month={execution_date[5:7]}/day={execution_date[8:10]}/data.json"
-    
-    #s3_hook.load_string(
-    #    string_data=data.to_json(orient='records'),
-    #    key=s3_key,
-    #    bucket_name=S3_BUCKET,
-    #    replace=True
-    #)
-    
-    context['task_instance'].xcom_push(key='fda_s3_key', value= "abederf")
-    context['task_instance'].xcom_push(key='fda_record_count', value= 29)
-    
-    return s3_key
 
 
-def extract_clinical_trials(**context):
-    """Extract clinical trials data"""
-    from src.extractors.clinicaltrials_extractor import ClinicalTrialsExtractor
-    
+def validate_extraction(**context):
+    """Validate extracted data landed in S3"""
     execution_date = context['ds']
-    extractor = ClinicalTrialsExtractor()
-    
-    # Extract data
-    data = extractor.extract_studies(
-        last_update_date=execution_date,
-        page_size=config['extraction']['clinical_trials_limit']
-    )
-    
-    # Save raw data to S3
     s3_hook = S3Hook(aws_conn_id=AWS_CONN_ID)
-    s3_key = f"raw/clinical_trials/year={execution_date[:4]}/month={execution_date[5:7]}/day={execution_date[8:10]}/data.json"
-    
-    s3_hook.load_string(
-        string_data=data.to_json(orient='records'),
-        key=s3_key,
-        bucket_name=S3_BUCKET,
-        replace=True
-    )
-    
-    context['task_instance'].xcom_push(key='ct_s3_key', value=s3_key)
-    context['task_instance'].xcom_push(key='ct_record_count', value=len(data))
-    
-    return s3_key
 
+    fda_key = raw_s3_key('fda', execution_date)
+    ct_key = raw_s3_key('clinical_trials', execution_date)
 
-def validate_extraction(**context):
-    """Validate extracted data"""
-    ti = context['task_instance']
-    fda_count = ti.xcom_pull(task_ids='extract_fda_data', key='fda_record_count')
-    ct_count = ti.xcom_pull(task_ids='extract_clinical_trials', key='ct_record_count')
-    
-    if fda_count == 0:
-        raise ValueError("No FDA records extracted!")
-    if ct_count == 0:
-        raise ValueError("No Clinical Trials records extracted!")
-    
-    print(f"Validation passed: FDA={fda_count}, Clinical Trials={ct_count}")
+    if not s3_hook.check_for_key(fda_key, bucket_name=S3_BUCKET):
+        raise ValueError(f"No FDA extract found at s3://{S3_BUCKET}/{fda_key}")
+    if not s3_hook.check_for_key(ct_key, bucket_name=S3_BUCKET):
+        raise ValueError(f"No Clinical Trials extract found at s3://{S3_BUCKET}/{ct_key}")
+
+    print(f"Validation passed: {fda_key}, {ct_key}")
     return True
 
 
@@ -135,20 +97,16 @@ def quality_check(**context):
 
 def send_completion_notification(**context):
     """Send completion notification"""
-    ti = context['task_instance']
     execution_date = context['ds']
-    
-    fda_count = ti.xcom_pull(task_ids='extract_fda_data', key='fda_record_count')
-    ct_count = ti.xcom_pull(task_ids='extract_clinical_trials', key='ct_record_count')
-    
+
     message = f"""
     Medical ETL Pipeline Completed Successfully
-    
+
     Date: {execution_date}
-    FDA Records: {fda_count}
-    Clinical Trials: {ct_count}
+    FDA Extract: s3://{S3_BUCKET}/{raw_s3_key('fda', execution_date)}
+    Clinical Trials Extract: s3://{S3_BUCKET}/{raw_s3_key('clinical_trials', execution_date)}
     S3 Bucket: {S3_BUCKET}
-    
+
     Data available at:
     s3://{S3_BUCKET}/processed/year={execution_date[:4]}/month={execution_date[5:7]}/day={execution_date[8:10]}/
     """
@@ -171,25 +129,66 @@ with DAG(
     # Start task
     start = EmptyOperator(task_id='start')
     
-    # Extraction tasks
+    # Extraction tasks run in their own pods (like transform) so API
+    # pagination fan-out doesn't compete with the Airflow worker
     with TaskGroup('extraction', tooltip="Extract data from sources") as extraction:
-        
-        extract_fda = PythonOperator(
+
+        extract_fda = KubernetesPodOperator(
             task_id='extract_fda_data',
-            python_callable=extract_fda_data,
+            name='medical-etl-extract-fda',
+            namespace='airflow',
+            image=DOCKER_IMAGE,
+            pool=FDA_API_POOL,
+            cmds=['python', '-m', 'src.extractors.fda_extractor'],
+            arguments=[
+                '--date', '{{ ds }}',
+                '--bucket', S3_BUCKET,
+                '--limit', str(load_config()['extraction']['fda_limit']),
+            ],
+            env_vars={
+                'AWS_ACCESS_KEY_ID': os.getenv('AWS_ACCESS_KEY_ID'),
+                'AWS_SECRET_ACCESS_KEY': os.getenv('AWS_SECRET_ACCESS_KEY'),
+                'AWS_DEFAULT_REGION': os.getenv('AWS_DEFAULT_REGION', 'us-east-1'),
+            },
+            get_logs=True,
+            do_xcom_push=False,
+            is_delete_operator_pod=True,
+            in_cluster=True,
+            config_file=None,
+            startup_timeout_seconds=300,
         )
-        
-        extract_ct = PythonOperator(
+
+        extract_ct = KubernetesPodOperator(
             task_id='extract_clinical_trials',
-            python_callable=extract_clinical_trials,
+            name='medical-etl-extract-ct',
+            namespace='airflow',
+            image=DOCKER_IMAGE,
+            pool=CTGOV_API_POOL,
+            cmds=['python', '-m', 'src.extractors.clinicaltrials_extractor'],
+            arguments=[
+                '--date', '{{ ds }}',
+                '--bucket', S3_BUCKET,
+                '--page-size', str(load_config()['extraction']['clinical_trials_limit']),
+            ],
+            env_vars={
+                'AWS_ACCESS_KEY_ID': os.getenv('AWS_ACCESS_KEY_ID'),
+                'AWS_SECRET_ACCESS_KEY': os.getenv('AWS_SECRET_ACCESS_KEY'),
+                'AWS_DEFAULT_REGION': os.getenv('AWS_DEFAULT_REGION', 'us-east-1'),
+            },
+            get_logs=True,
+            do_xcom_push=False,
+            is_delete_operator_pod=True,
+            in_cluster=True,
+            config_file=None,
+            startup_timeout_seconds=300,
         )
-        
+
         validate = PythonOperator(
             task_id='validate_extraction',
             python_callable=validate_extraction,
             trigger_rule='all_success',
         )
-        
+
         [extract_fda, extract_ct] >> validate
     
     # Transformation task using Kubernetes
@@ -206,6 +205,7 @@ with DAG(
             'AWS_DEFAULT_REGION': os.getenv('AWS_DEFAULT_REGION', 'us-east-1'),
         },
         get_logs=True,
+        do_xcom_push=False,
         is_delete_operator_pod=True,
         in_cluster=True,
         config_file=None,
@@ -1,4 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from .fda_extractor import FDAExtractor
 from .clinicaltrials_extractor import ClinicalTrialsExtractor
 
-__all__ = ['FDAExtractor', 'ClinicalTrialsExtractor']
+__all__ = ['FDAExtractor', 'ClinicalTrialsExtractor', 'extract_concurrently']
+
+
+def extract_concurrently(fda_kwargs: dict, ct_kwargs: dict) -> tuple:
+    """
+    Run FDA and ClinicalTrials extractions concurrently
+
+    Both extractions are network-bound, so running them in parallel hides
+    the request round-trip latency of one source behind the other.
+
+    Args:
+        fda_kwargs: Keyword arguments for FDAExtractor.extract_drug_events
+        ct_kwargs: Keyword arguments for ClinicalTrialsExtractor.extract_studies
+
+    Returns:
+        Tuple of (fda_df, ct_df) DataFrames
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fda_future = executor.submit(
+            FDAExtractor().extract_drug_events, **fda_kwargs
+        )
+        ct_future = executor.submit(
+            ClinicalTrialsExtractor().extract_studies, **ct_kwargs
+        )
+        return fda_future.result(), ct_future.result()
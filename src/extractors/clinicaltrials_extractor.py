@@ -3,14 +3,22 @@ ClinicalTrials.gov Data Extractor
 Extracts clinical trial data from ClinicalTrials.gov API v2
 """
 
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
-import time
+from src.utils.http import get_session
 from src.utils.logger import get_logger
+from src.utils.rate_limiter import RateLimiter
+from src.utils.response_cache import get_response_cache
 
 logger = get_logger(__name__)
 
+# ClinicalTrials.gov tolerates ~2 requests/second per client
+_RATE_LIMITER = RateLimiter(rate=120, per_seconds=60.0)
+
 
 class ClinicalTrialsExtractor:
     """Extract data from ClinicalTrials.gov API v2"""
@@ -19,8 +27,11 @@ class ClinicalTrialsExtractor:
     
     def __init__(self):
         """Initialize ClinicalTrials extractor"""
-        self.session = requests.Session()
-        
+        # Shared pooled session: one connection pool serves both
+        # extractors and stays warm across runs in the same process
+        self.session = get_session()
+        self.response_cache = get_response_cache()
+
     def extract_studies(
         self,
         last_update_date: str,
@@ -41,39 +52,84 @@ class ClinicalTrialsExtractor:
         logger.info(f"Extracting Clinical Trials data updated after {last_update_date}")
         
         all_studies = []
-        page_token = None
-        
-        while True:
-            try:
-                studies, next_token = self._fetch_page(
-                    last_update_date=last_update_date,
-                    page_size=page_size,
-                    page_token=page_token
-                )
-                
-                all_studies.extend(studies)
-                logger.info(f"Fetched {len(studies)} studies (total: {len(all_studies)})")
-                
-                # Check stopping conditions
-                if not next_token:
-                    break
-                if max_studies and len(all_studies) >= max_studies:
-                    all_studies = all_studies[:max_studies]
-                    break
-                    
-                page_token = next_token
-                time.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Error fetching studies: {e}")
+
+        for studies in self._iter_pages(last_update_date, page_size):
+            all_studies.extend(studies)
+            logger.info(f"Fetched {len(studies)} studies (total: {len(all_studies)})")
+
+            if max_studies and len(all_studies) >= max_studies:
+                all_studies = all_studies[:max_studies]
                 break
-        
+
         # Convert to DataFrame
         df = self._parse_studies(all_studies)
         logger.info(f"Extracted {len(df)} clinical trial records")
-        
+
         return df
-    
+
+    def _iter_pages(self, last_update_date: str, page_size: int):
+        """Yield raw study lists with a one-page prefetch
+
+        The API's pageToken chains responses, so pages cannot be
+        fetched in bulk like FDA skip offsets — but the next request
+        can start the moment its token arrives, overlapping that round
+        trip with whatever the consumer does to the current page.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                self._fetch_page,
+                last_update_date=last_update_date,
+                page_size=page_size,
+                page_token=None
+            )
+            while future is not None:
+                try:
+                    studies, next_token = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching studies: {e}")
+                    return
+
+                # Kick off the next fetch before handing this page back
+                future = executor.submit(
+                    self._fetch_page,
+                    last_update_date=last_update_date,
+                    page_size=page_size,
+                    page_token=next_token
+                ) if next_token else None
+
+                yield studies
+
+    def iter_record_batches(
+        self,
+        last_update_date: str,
+        page_size: int = 100,
+        max_studies: Optional[int] = None
+    ):
+        """
+        Stream extraction as Arrow RecordBatches, one per API page
+
+        Keeps peak memory bounded by page size for consumers that write
+        incrementally instead of materializing the full DataFrame. The
+        underlying page iterator prefetches one page ahead, so each
+        batch's parse/convert work overlaps the next network round trip.
+
+        Yields:
+            pyarrow.RecordBatch per fetched page
+        """
+        remaining = max_studies
+
+        for studies in self._iter_pages(last_update_date, page_size):
+            if remaining is not None:
+                studies = studies[:remaining]
+                remaining -= len(studies)
+
+            if studies:
+                df = self._parse_studies(studies)
+                yield pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+            if remaining is not None and remaining <= 0:
+                break
+
     def _fetch_page(
         self,
         last_update_date: str,
@@ -90,16 +146,25 @@ class ClinicalTrialsExtractor:
         
         if page_token:
             params['pageToken'] = page_token
-        
+
         try:
-            response = self.session.get(
-                self.BASE_URL,
-                params=params,
-                timeout=30
-            )
-            response.raise_for_status()
-            data = response.json()
-            
+            data = None
+            if self.response_cache:
+                data = self.response_cache.get(self.BASE_URL, params)
+
+            if data is None:
+                _RATE_LIMITER.acquire()
+                response = self.session.get(
+                    self.BASE_URL,
+                    params=params,
+                    timeout=30
+                )
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+
+                if self.response_cache:
+                    self.response_cache.put(self.BASE_URL, params, data)
+
             studies = data.get('studies', [])
             next_token = data.get('nextPageToken')
             
@@ -109,124 +174,142 @@ class ClinicalTrialsExtractor:
             logger.error(f"Request failed: {e}")
             raise
     
+    # Output column -> flattened JSON path produced by pd.json_normalize
+    SCALAR_FIELDS = {
+        # Identification
+        'nct_id': 'protocolSection.identificationModule.nctId',
+        'org_study_id': 'protocolSection.identificationModule.orgStudyIdInfo.id',
+        'brief_title': 'protocolSection.identificationModule.briefTitle',
+        'official_title': 'protocolSection.identificationModule.officialTitle',
+
+        # Status
+        'overall_status': 'protocolSection.statusModule.overallStatus',
+        'study_first_post_date': 'protocolSection.statusModule.studyFirstPostDateStruct.date',
+        'last_update_post_date': 'protocolSection.statusModule.lastUpdatePostDateStruct.date',
+        'start_date': 'protocolSection.statusModule.startDateStruct.date',
+        'completion_date': 'protocolSection.statusModule.completionDateStruct.date',
+
+        # Description
+        'brief_summary': 'protocolSection.descriptionModule.briefSummary',
+        'detailed_description': 'protocolSection.descriptionModule.detailedDescription',
+
+        # Design
+        'study_type': 'protocolSection.designModule.studyType',
+        'enrollment_count': 'protocolSection.designModule.enrollmentInfo.count',
+        'allocation': 'protocolSection.designModule.designInfo.allocation',
+        'intervention_model': 'protocolSection.designModule.designInfo.interventionModel',
+        'primary_purpose': 'protocolSection.designModule.designInfo.primaryPurpose',
+        'masking': 'protocolSection.designModule.designInfo.masking.masking',
+
+        # Eligibility
+        'gender': 'protocolSection.eligibilityModule.sex',
+        'min_age': 'protocolSection.eligibilityModule.minimumAge',
+        'max_age': 'protocolSection.eligibilityModule.maximumAge',
+        'accepts_healthy': 'protocolSection.eligibilityModule.healthyVolunteers',
+
+        # Sponsor
+        'lead_sponsor': 'protocolSection.sponsorCollaboratorsModule.leadSponsor.name',
+    }
+
+    # Output column -> flattened path of a list-of-strings field
+    LIST_FIELDS = {
+        'conditions': 'protocolSection.conditionsModule.conditions',
+        'keywords': 'protocolSection.conditionsModule.keywords',
+        'phase': 'protocolSection.designModule.phases',
+    }
+
+    # Columns converted to datetime after parsing
+    DATE_COLUMNS = [
+        'study_first_post_date', 'last_update_post_date',
+        'start_date', 'completion_date',
+    ]
+
+    # Column order matching the original per-record schema
+    COLUMNS = [
+        'nct_id', 'org_study_id', 'brief_title', 'official_title',
+        'overall_status', 'study_first_post_date', 'last_update_post_date',
+        'start_date', 'completion_date', 'brief_summary',
+        'detailed_description', 'conditions', 'keywords', 'study_type',
+        'phase', 'enrollment_count', 'allocation', 'intervention_model',
+        'primary_purpose', 'masking', 'intervention_types',
+        'primary_outcome_measures', 'gender', 'min_age', 'max_age',
+        'accepts_healthy', 'location_countries', 'lead_sponsor',
+    ]
+
     def _parse_studies(self, studies: List[dict]) -> pd.DataFrame:
         """Parse clinical trial studies into structured DataFrame"""
-        parsed_data = []
-        
-        for study in studies:
-            try:
-                protocol = study.get('protocolSection', {})
-                
-                # Identification
-                id_module = protocol.get('identificationModule', {})
-                
-                # Status
-                status_module = protocol.get('statusModule', {})
-                
-                # Description
-                desc_module = protocol.get('descriptionModule', {})
-                
-                # Conditions
-                conditions_module = protocol.get('conditionsModule', {})
-                
-                # Design
-                design_module = protocol.get('designModule', {})
-                
-                # Arms/Interventions
-                arms_module = protocol.get('armsInterventionsModule', {})
-                
-                # Outcomes
-                outcomes_module = protocol.get('outcomesModule', {})
-                
-                # Eligibility
-                eligibility_module = protocol.get('eligibilityModule', {})
-                
-                # Contacts
-                contacts_module = protocol.get('contactsLocationsModule', {})
-                
-                parsed = {
-                    # Identification
-                    'nct_id': id_module.get('nctId'),
-                    'org_study_id': id_module.get('orgStudyIdInfo', {}).get('id'),
-                    'brief_title': id_module.get('briefTitle'),
-                    'official_title': id_module.get('officialTitle'),
-                    
-                    # Status
-                    'overall_status': status_module.get('overallStatus'),
-                    'study_first_post_date': status_module.get('studyFirstPostDateStruct', {}).get('date'),
-                    'last_update_post_date': status_module.get('lastUpdatePostDateStruct', {}).get('date'),
-                    'start_date': status_module.get('startDateStruct', {}).get('date'),
-                    'completion_date': status_module.get('completionDateStruct', {}).get('date'),
-                    
-                    # Description
-                    'brief_summary': desc_module.get('briefSummary'),
-                    'detailed_description': desc_module.get('detailedDescription'),
-                    
-                    # Conditions
-                    'conditions': ', '.join(conditions_module.get('conditions', [])),
-                    'keywords': ', '.join(conditions_module.get('keywords', [])),
-                    
-                    # Design
-                    'study_type': design_module.get('studyType'),
-                    'phase': ', '.join(design_module.get('phases', [])),
-                    'enrollment_count': design_module.get('enrollmentInfo', {}).get('count'),
-                    'allocation': design_module.get('designInfo', {}).get('allocation'),
-                    'intervention_model': design_module.get('designInfo', {}).get('interventionModel'),
-                    'primary_purpose': design_module.get('designInfo', {}).get('primaryPurpose'),
-                    'masking': design_module.get('designInfo', {}).get('masking', {}).get('masking'),
-                    
-                    # Interventions
-                    'intervention_types': self._extract_interventions(arms_module),
-                    
-                    # Outcomes
-                    'primary_outcome_measures': self._extract_outcomes(
-                        outcomes_module.get('primaryOutcomes', [])
-                    ),
-                    
-                    # Eligibility
-                    'gender': eligibility_module.get('sex'),
-                    'min_age': eligibility_module.get('minimumAge'),
-                    'max_age': eligibility_module.get('maximumAge'),
-                    'accepts_healthy': eligibility_module.get('healthyVolunteers'),
-                    
-                    # Location
-                    'location_countries': ', '.join(
-                        [loc.get('country', '') for loc in contacts_module.get('locations', [])]
-                    ),
-                    
-                    # Sponsor
-                    'lead_sponsor': protocol.get('sponsorCollaboratorsModule', {})
-                        .get('leadSponsor', {}).get('name'),
-                }
-                
-                parsed_data.append(parsed)
-                
-            except Exception as e:
-                logger.warning(f"Error parsing study {study.get('protocolSection', {}).get('identificationModule', {}).get('nctId')}: {e}")
-                continue
-        
-        df = pd.DataFrame(parsed_data)
-        
-        # Data type conversions
-        if not df.empty:
-            date_columns = ['study_first_post_date', 'last_update_post_date', 'start_date', 'completion_date']
-            for col in date_columns:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-            
-            if 'enrollment_count' in df.columns:
-                df['enrollment_count'] = pd.to_numeric(df['enrollment_count'], errors='coerce')
-        
+        if not studies:
+            return pd.DataFrame()
+
+        # Flatten all nested modules in one vectorized pass instead of
+        # walking dict.get chains per record in Python
+        flat = pd.json_normalize(studies, sep='.')
+
+        # Hoist the column lookup machinery out of the per-field loop:
+        # one set membership test per field and one shared null column
+        # instead of rebuilding an empty Series per missing path
+        available = set(flat.columns)
+        null_column = pd.Series(None, index=flat.index, dtype=object)
+
+        def column(path):
+            return flat[path] if path in available else null_column
+
+        df = pd.DataFrame(index=flat.index)
+
+        for out_col, path in self.SCALAR_FIELDS.items():
+            df[out_col] = column(path)
+
+        for out_col, path in self.LIST_FIELDS.items():
+            df[out_col] = column(path).map(
+                lambda v: ', '.join(v) if isinstance(v, list) else ''
+            )
+
+        # Interventions
+        df['intervention_types'] = column(
+            'protocolSection.armsInterventionsModule.interventions'
+        ).map(self._join_intervention_types)
+
+        # Outcomes
+        df['primary_outcome_measures'] = column(
+            'protocolSection.outcomesModule.primaryOutcomes'
+        ).map(lambda v: self._extract_outcomes(v) if isinstance(v, list) else '')
+
+        # Location
+        df['location_countries'] = column(
+            'protocolSection.contactsLocationsModule.locations'
+        ).map(
+            lambda v: ', '.join(loc.get('country', '') for loc in v)
+            if isinstance(v, list) else ''
+        )
+
+        df = df[self.COLUMNS]
+
+        # Data type conversions: the column set is pinned by COLUMNS, so
+        # convert all typed columns in single batched assignments rather
+        # than one guarded rewrite per column
+        df[self.DATE_COLUMNS] = df[self.DATE_COLUMNS].apply(pd.to_datetime, errors='coerce')
+        df['enrollment_count'] = pd.to_numeric(df['enrollment_count'], errors='coerce')
+
         return df
     
     def _extract_interventions(self, arms_module: dict) -> str:
         """Extract intervention types"""
         try:
-            interventions = arms_module.get('interventions', [])
-            types = [i.get('type', '') for i in interventions]
-            return ', '.join(set(filter(None, types)))
+            return self._join_intervention_types(arms_module.get('interventions', []))
         except Exception:
             return ''
+
+    @staticmethod
+    def _join_intervention_types(interventions) -> str:
+        """Join unique intervention types from a list of interventions"""
+        if not isinstance(interventions, list):
+            return ''
+        # Single pass: dict keys dedup while preserving first-seen order,
+        # replacing the list -> filter -> set -> join chain
+        types = dict.fromkeys(
+            t for i in interventions if (t := i.get('type'))
+        )
+        return ', '.join(types)
     
     def _extract_outcomes(self, outcomes: List[dict]) -> str:
         """Extract outcome measures"""
@@ -237,14 +320,42 @@ class ClinicalTrialsExtractor:
             return ''
 
 
-if __name__ == '__main__':
-    # Test the extractor
+def main():
+    """Main entry point for containerized extraction"""
+    import argparse
+    from src.loaders.s3_loader import S3Loader
+
+    parser = argparse.ArgumentParser(description='Extract clinical trials data')
+    parser.add_argument('--date', required=True, help='Last update date filter (YYYY-MM-DD)')
+    parser.add_argument('--bucket', required=True, help='S3 bucket name')
+    parser.add_argument('--page-size', type=int, default=100, help='Studies per page')
+    parser.add_argument('--max-studies', type=int, default=None, help='Maximum studies to fetch')
+    parser.add_argument('--force', action='store_true', help='Re-extract even if the partition exists')
+
+    args = parser.parse_args()
+
+    year, month, day = args.date.split('-')
+    s3_key = f"raw/clinical_trials/year={year}/month={month}/day={day}/data.parquet"
+
+    loader = S3Loader(args.bucket)
+
+    # Idempotency: reruns and backfills skip the API when the partition
+    # already landed, unless explicitly forced
+    if not args.force and loader.object_exists(s3_key):
+        print(f"Partition already extracted, skipping: s3://{args.bucket}/{s3_key}")
+        return
+
     extractor = ClinicalTrialsExtractor()
     data = extractor.extract_studies(
-        last_update_date='2024-01-01',
-        page_size=50,
-        max_studies=100
+        last_update_date=args.date,
+        page_size=args.page_size,
+        max_studies=args.max_studies
     )
-    print(f"Extracted {len(data)} records")
-    print(data.head())
-    print("\nColumns:", data.columns.tolist())
\ No newline at end of file
+
+    loader.write_parquet(data, s3_key)
+
+    print(f"Extracted {len(data)} clinical trial records to s3://{args.bucket}/{s3_key}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
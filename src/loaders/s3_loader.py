@@ -4,14 +4,30 @@ Handles reading and writing data to AWS S3
 """
 
 import boto3
+import hashlib
+import orjson
 import pandas as pd
-import json
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import io
+import os
+from boto3.s3.transfer import TransferConfig
+from functools import cached_property
 from typing import Optional, Any
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Multipart upload settings: payloads above the threshold are split into
+# parallel parts instead of one blocking PUT
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
 
 class S3Loader:
     """Load and save data to S3"""
@@ -26,9 +42,21 @@ class S3Loader:
         """
         self.bucket_name = bucket_name
         self.region = region
-        self.s3_client = boto3.client('s3', region_name=region)
-        
+        # Opt-in local object cache: reruns send conditional GETs and
+        # reuse the on-disk copy when the object's ETag is unchanged
+        self.object_cache_dir = os.getenv('ETL_S3_OBJECT_CACHE_DIR')
+
         logger.info(f"Initialized S3Loader for bucket: {bucket_name}")
+
+    @cached_property
+    def s3_client(self):
+        """boto3 S3 client, created on first use
+
+        Lazy so constructing a loader stays free of botocore's
+        endpoint/loader discovery; callers that never touch S3 (or are
+        constructed just to read config) skip it entirely.
+        """
+        return boto3.client('s3', region_name=self.region)
     
     def read_json(self, s3_key: str) -> Optional[list]:
         """
@@ -48,8 +76,9 @@ class S3Loader:
                 Key=s3_key
             )
             
-            content = response['Body'].read().decode('utf-8')
-            data = json.loads(content)
+            # orjson decodes bytes directly, several times faster than
+            # stdlib json and without the intermediate str
+            data = orjson.loads(response['Body'].read())
             
             logger.info(f"Successfully read {len(data)} records")
             return data
@@ -72,12 +101,19 @@ class S3Loader:
         try:
             logger.info(f"Writing JSON to s3://{self.bucket_name}/{s3_key}")
             
-            json_str = json.dumps(data, default=str, indent=2)
-            
+            # orjson returns bytes, so the payload goes straight to S3;
+            # OPT_SERIALIZE_NUMPY handles np.int64/np.ndarray values
+            # natively instead of falling back to default=str per value
+            body = orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            )
+
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=json_str.encode('utf-8'),
+                Body=body,
                 ContentType='application/json'
             )
             
@@ -87,59 +123,160 @@ class S3Loader:
             logger.error(f"Error writing JSON to S3: {e}")
             raise
     
-    def read_parquet(self, s3_key: str) -> pd.DataFrame:
+    def read_parquet(self, s3_key: str, columns: Optional[list] = None) -> pd.DataFrame:
         """
         Read Parquet data from S3
-        
+
         Args:
             s3_key: S3 object key
-            
+            columns: Optional column subset; only the matching Parquet
+                column chunks are decoded, cutting parse time and memory
+
         Returns:
             DataFrame with data
         """
         try:
             logger.info(f"Reading Parquet from s3://{self.bucket_name}/{s3_key}")
-            
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            df = pd.read_parquet(io.BytesIO(response['Body'].read()))
-            
+
+            # BufferReader reads the response bytes zero-copy, unlike
+            # BytesIO which duplicates the payload
+            parquet_file = pq.ParquetFile(pa.BufferReader(self._get_object_bytes(s3_key)))
+
+            if columns is not None:
+                # Project onto the columns actually present so callers
+                # can name optional fields without failing the read
+                available = parquet_file.schema_arrow.names
+                columns = [col for col in columns if col in available]
+
+            # Decode straight into Arrow columnar memory and hand the
+            # buffers to pandas; self_destruct releases each Arrow
+            # column as it is converted instead of holding both copies
+            table = parquet_file.read(columns=columns, use_threads=True)
+            df = table.to_pandas(self_destruct=True)
+
             logger.info(f"Successfully read {len(df)} records")
             return df
-            
+
         except self.s3_client.exceptions.NoSuchKey:
             logger.warning(f"Key not found: {s3_key}")
             return pd.DataFrame()
         except Exception as e:
             logger.error(f"Error reading Parquet from S3: {e}")
             raise
+
+    def _object_cache_paths(self, s3_key: str) -> tuple:
+        """Local cache paths (data, etag) for an object"""
+        key = hashlib.sha1(f"{self.bucket_name}/{s3_key}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.object_cache_dir, key)
+        return f"{base}.bin", f"{base}.etag"
+
+    def _get_object_bytes(self, s3_key: str) -> bytes:
+        """
+        Fetch object bytes, skipping the download when unchanged
+
+        With ETL_S3_OBJECT_CACHE_DIR set, the last-seen ETag is sent as
+        IfNoneMatch; a NotModified reply means the whole transfer is
+        avoided and the local copy is returned, which makes Airflow
+        retries and reruns on the same partition near-free.
+        """
+        if not self.object_cache_dir:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=s3_key
+            )
+            return response['Body'].read()
+
+        data_path, etag_path = self._object_cache_paths(s3_key)
+
+        etag = None
+        if os.path.exists(data_path) and os.path.exists(etag_path):
+            with open(etag_path, 'r') as f:
+                etag = f.read().strip()
+
+        if etag:
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    IfNoneMatch=etag
+                )
+            except Exception as e:
+                code = str(getattr(e, 'response', {}).get('Error', {}).get('Code', ''))
+                if code in ('304', 'NotModified'):
+                    logger.info(f"Object unchanged, using cached copy of {s3_key}")
+                    with open(data_path, 'rb') as f:
+                        return f.read()
+                raise
+        else:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=s3_key
+            )
+
+        data = response['Body'].read()
+
+        new_etag = response.get('ETag')
+        if new_etag:
+            os.makedirs(self.object_cache_dir, exist_ok=True)
+            tmp_path = f"{data_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, data_path)
+            tmp_path = f"{etag_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(new_etag)
+            os.replace(tmp_path, etag_path)
+
+        return data
     
-    def write_parquet(self, df: pd.DataFrame, s3_key: str):
+    def write_parquet(
+        self,
+        df: pd.DataFrame,
+        s3_key: str,
+        compression: str = 'zstd',
+        compression_level: int = 3,
+        row_group_size: Optional[int] = None
+    ):
         """
         Write DataFrame as Parquet to S3
-        
+
         Args:
             df: DataFrame to write
             s3_key: S3 object key
+            compression: Parquet codec; zstd compresses the pipeline's
+                low-cardinality string columns 2-3x tighter than snappy
+            compression_level: Codec effort level
+            row_group_size: Optional rows per row group; smaller groups
+                let readers prune via statistics at some size cost
         """
         try:
             logger.info(f"Writing Parquet to s3://{self.bucket_name}/{s3_key}")
-            
-            # Convert DataFrame to Parquet in memory
+
+            # Convert DataFrame to Parquet in memory; dictionary
+            # encoding plus statistics keeps files small and lets
+            # readers prune pages
             buffer = io.BytesIO()
-            df.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+            pq.write_table(
+                pa.Table.from_pandas(df, preserve_index=False),
+                buffer,
+                compression=compression,
+                compression_level=compression_level,
+                use_dictionary=True,
+                write_statistics=True,
+                data_page_size=1_048_576,
+                row_group_size=row_group_size
+            )
             buffer.seek(0)
-            
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=buffer.getvalue(),
-                ContentType='application/octet-stream'
+
+            # Multipart upload for large payloads, plain PUT for small ones
+            self.s3_client.upload_fileobj(
+                buffer,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={'ContentType': 'application/octet-stream'},
+                Config=TRANSFER_CONFIG
             )
-            
+
             logger.info(f"Successfully wrote {len(df)} records to {s3_key}")
             
         except Exception as e:
@@ -164,7 +301,10 @@ class S3Loader:
                 Key=s3_key
             )
             
-            df = pd.read_csv(io.BytesIO(response['Body'].read()))
+            # pyarrow's CSV reader parses blocks in parallel across
+            # threads, unlike the single-threaded pandas parser
+            table = pacsv.read_csv(pa.BufferReader(response['Body'].read()))
+            df = table.to_pandas(self_destruct=True)
             
             logger.info(f"Successfully read {len(df)} records")
             return df
@@ -187,14 +327,15 @@ class S3Loader:
         try:
             logger.info(f"Writing CSV to s3://{self.bucket_name}/{s3_key}")
             
-            # Convert DataFrame to CSV in memory
-            csv_buffer = io.StringIO()
-            df.to_csv(csv_buffer, index=False)
-            
+            # Convert DataFrame to CSV in memory via pyarrow's
+            # multithreaded writer
+            sink = pa.BufferOutputStream()
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), sink)
+
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=csv_buffer.getvalue().encode('utf-8'),
+                Body=sink.getvalue().to_pybytes(),
                 ContentType='text/csv'
             )
             
@@ -216,20 +357,20 @@ class S3Loader:
         """
         try:
             logger.info(f"Listing objects with prefix: {prefix}")
-            
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                return []
-            
-            keys = [obj['Key'] for obj in response['Contents']]
+
+            # Paginate so prefixes with more than 1000 keys are listed
+            # completely instead of silently truncated
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            keys = [
+                obj['Key']
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                for obj in page.get('Contents', [])
+            ]
+
             logger.info(f"Found {len(keys)} objects")
-            
+
             return keys
-            
+
         except Exception as e:
             logger.error(f"Error listing objects: {e}")
             raise
@@ -254,44 +395,90 @@ class S3Loader:
         except Exception as e:
             logger.error(f"Error deleting object: {e}")
             raise
-    
-    def object_exists(self, s3_key: str) -> bool:
+
+    def delete_prefix(self, prefix: str) -> int:
         """
-        Check if object exists in S3
-        
+        Delete all objects under a prefix with batched requests
+
+        Uses delete_objects in chunks of 1000 keys, so bulk cleanup
+        costs O(N/1000) API calls instead of one round trip per key.
+
         Args:
-            s3_key: S3 object key
-            
+            prefix: S3 key prefix
+
         Returns:
-            True if exists, False otherwise
+            Number of objects deleted
         """
         try:
-            self.s3_client.head_object(
+            keys = self.list_objects(prefix)
+
+            for start in range(0, len(keys), 1000):
+                batch = keys[start:start + 1000]
+                self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in batch],
+                        'Quiet': True
+                    }
+                )
+
+            logger.info(f"Deleted {len(keys)} objects under {prefix}")
+
+            return len(keys)
+
+        except Exception as e:
+            logger.error(f"Error deleting prefix {prefix}: {e}")
+            raise
+
+    def _head(self, s3_key: str) -> Optional[dict]:
+        """HEAD an object, returning its metadata or None if absent"""
+        try:
+            return self.s3_client.head_object(
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
-            return True
         except self.s3_client.exceptions.ClientError:
-            return False
-    
+            return None
+
+    def get_object_metadata(self, s3_key: str) -> Optional[dict]:
+        """
+        Get object metadata with a single HEAD request
+
+        Callers that need both existence and size should use this once
+        instead of paying one round trip per question.
+
+        Args:
+            s3_key: S3 object key
+
+        Returns:
+            head_object response dict or None if not found
+        """
+        return self._head(s3_key)
+
+    def object_exists(self, s3_key: str) -> bool:
+        """
+        Check if object exists in S3
+
+        Args:
+            s3_key: S3 object key
+
+        Returns:
+            True if exists, False otherwise
+        """
+        return self._head(s3_key) is not None
+
     def get_object_size(self, s3_key: str) -> Optional[int]:
         """
         Get size of object in bytes
-        
+
         Args:
             s3_key: S3 object key
-            
+
         Returns:
             Size in bytes or None if not found
         """
-        try:
-            response = self.s3_client.head_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            return response['ContentLength']
-        except self.s3_client.exceptions.ClientError:
-            return None
+        metadata = self._head(s3_key)
+        return metadata['ContentLength'] if metadata else None
 
 
 if __name__ == '__main__':
@@ -13,7 +13,17 @@ logger = get_logger(__name__)
 
 class DataQualityChecker:
     """Validate data quality for medical ETL pipeline"""
-    
+
+    # The only columns the checks below touch; the Parquet read is
+    # projected onto these so the rest of the enriched table is never
+    # decoded or held in memory
+    CHECK_COLUMNS = [
+        'data_source', 'safetyreportid', 'receivedate', 'drug_name',
+        'nct_id', 'brief_title', 'overall_status', 'severity_score',
+        'adverse_event_count', 'enrollment_count', 'patient_age',
+        'processed_date', 'start_date', 'completion_date',
+    ]
+
     def __init__(self, s3_bucket: str):
         """
         Initialize data quality checker
@@ -47,12 +57,20 @@ class DataQualityChecker:
                     'failures': ['No data to validate']
                 }
             
+            # Several checks slice by data_source; compute each equality
+            # scan once here instead of re-running it per check
+            if 'data_source' in df.columns:
+                fda_mask = df['data_source'] == 'FDA_OpenFDA'
+                ct_mask = df['data_source'] == 'ClinicalTrials_gov'
+            else:
+                fda_mask = ct_mask = None
+
             # Run all checks
             checks = [
-                self._check_completeness(df),
+                self._check_completeness(df, fda_mask, ct_mask),
                 self._check_data_types(df),
                 self._check_value_ranges(df),
-                self._check_duplicates(df),
+                self._check_duplicates(df, fda_mask, ct_mask),
                 self._check_record_count(df),
                 self._check_date_consistency(df)
             ]
@@ -95,20 +113,29 @@ class DataQualityChecker:
         s3_key = f"processed/year={year}/month={month}/day={day}/enriched_data.parquet"
         
         logger.info(f"Loading data from {s3_key}")
-        return self.s3_loader.read_parquet(s3_key)
+        df = self.s3_loader.read_parquet(s3_key, columns=self.CHECK_COLUMNS)
+
+        # Low-cardinality string columns: categorical codes turn the
+        # equality scans and value_counts below into int8 comparisons
+        # instead of per-value string hashing
+        for col in ('data_source', 'overall_status', 'drug_name'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        return df
     
-    def _check_completeness(self, df: pd.DataFrame) -> Dict:
+    def _check_completeness(self, df: pd.DataFrame, fda_mask=None, ct_mask=None) -> Dict:
         """Check for missing critical fields"""
         logger.info("Checking data completeness")
-        
+
         failures = []
-        
+
         # Define required columns based on data source
-        if 'data_source' in df.columns:
-            if (df['data_source'] == 'FDA_OpenFDA').any():
+        if fda_mask is not None:
+            if fda_mask.any():
                 required_fda = ['safetyreportid', 'receivedate', 'drug_name']
-                fda_df = df[df['data_source'] == 'FDA_OpenFDA']
-                
+                fda_df = df[fda_mask]
+
                 for col in required_fda:
                     if col not in fda_df.columns:
                         failures.append(f"Missing required FDA column: {col}")
@@ -118,11 +145,11 @@ class DataQualityChecker:
                             failures.append(
                                 f"FDA column {col} has {null_pct:.1f}% missing values"
                             )
-            
-            if (df['data_source'] == 'ClinicalTrials_gov').any():
+
+            if ct_mask.any():
                 required_ct = ['nct_id', 'brief_title', 'overall_status']
-                ct_df = df[df['data_source'] == 'ClinicalTrials_gov']
-                
+                ct_df = df[ct_mask]
+
                 for col in required_ct:
                     if col not in ct_df.columns:
                         failures.append(f"Missing required CT column: {col}")
@@ -171,28 +198,34 @@ class DataQualityChecker:
         
         failures = []
         
+        # Violations are rare, so each mask is evaluated on the raw
+        # numpy array and any() decides cheaply before the full count
+        # is computed; clean data never pays for a sum
+
         # Check severity score
         if 'severity_score' in df.columns:
-            invalid = df[(df['severity_score'] < 0) | (df['severity_score'] > 100)]
-            if len(invalid) > 0:
+            values = df['severity_score'].to_numpy()
+            bad = (values < 0) | (values > 100)
+            if bad.any():
                 failures.append(
-                    f"Found {len(invalid)} records with invalid severity_score"
+                    f"Found {int(bad.sum())} records with invalid severity_score"
                 )
-        
+
         # Check patient age
         if 'patient_age' in df.columns:
-            invalid = df[(df['patient_age'] < 0) | (df['patient_age'] > 120)]
-            if len(invalid) > 0:
+            values = df['patient_age'].to_numpy()
+            bad = (values < 0) | (values > 120)
+            if bad.any():
                 failures.append(
-                    f"Found {len(invalid)} records with invalid patient_age"
+                    f"Found {int(bad.sum())} records with invalid patient_age"
                 )
-        
+
         # Check enrollment count
         if 'enrollment_count' in df.columns:
-            invalid = df[df['enrollment_count'] < 0]
-            if len(invalid) > 0:
+            bad = df['enrollment_count'].to_numpy() < 0
+            if bad.any():
                 failures.append(
-                    f"Found {len(invalid)} records with negative enrollment_count"
+                    f"Found {int(bad.sum())} records with negative enrollment_count"
                 )
         
         return {
@@ -201,27 +234,31 @@ class DataQualityChecker:
             'failures': failures
         }
     
-    def _check_duplicates(self, df: pd.DataFrame) -> Dict:
+    def _check_duplicates(self, df: pd.DataFrame, fda_mask=None, ct_mask=None) -> Dict:
         """Check for duplicate records"""
         logger.info("Checking for duplicates")
-        
+
         failures = []
-        
-        # Check for duplicates based on primary keys
+
+        # Check for duplicates based on primary keys: value_counts needs
+        # one hash pass over the key column, vs duplicated(keep=False)
+        # hashing twice and materializing the duplicate rows
         if 'safetyreportid' in df.columns:
-            fda_df = df[df['data_source'] == 'FDA_OpenFDA'] if 'data_source' in df.columns else df
-            duplicates = fda_df[fda_df.duplicated(subset=['safetyreportid'], keep=False)]
-            if len(duplicates) > 0:
+            keys = df.loc[fda_mask, 'safetyreportid'] if fda_mask is not None else df['safetyreportid']
+            counts = keys.value_counts()
+            dup_rows = int(counts[counts > 1].sum())
+            if dup_rows > 0:
                 failures.append(
-                    f"Found {len(duplicates)} duplicate FDA safety reports"
+                    f"Found {dup_rows} duplicate FDA safety reports"
                 )
-        
+
         if 'nct_id' in df.columns:
-            ct_df = df[df['data_source'] == 'ClinicalTrials_gov'] if 'data_source' in df.columns else df
-            duplicates = ct_df[ct_df.duplicated(subset=['nct_id'], keep=False)]
-            if len(duplicates) > 0:
+            keys = df.loc[ct_mask, 'nct_id'] if ct_mask is not None else df['nct_id']
+            counts = keys.value_counts()
+            dup_rows = int(counts[counts > 1].sum())
+            if dup_rows > 0:
                 failures.append(
-                    f"Found {len(duplicates)} duplicate clinical trial records"
+                    f"Found {dup_rows} duplicate clinical trial records"
                 )
         
         return {
@@ -265,28 +302,26 @@ class DataQualityChecker:
         
         failures = []
         
-        # Check that start_date is before completion_date
+        # Check that start_date is before completion_date; comparisons on
+        # datetime columns treat NaT as False, so no explicit notna mask
+        # or row materialization is needed
         if 'start_date' in df.columns and 'completion_date' in df.columns:
-            invalid = df[
-                (df['start_date'].notna()) &
-                (df['completion_date'].notna()) &
-                (df['start_date'] > df['completion_date'])
-            ]
-            if len(invalid) > 0:
+            n_bad = int((df['start_date'] > df['completion_date']).sum())
+            if n_bad > 0:
                 failures.append(
-                    f"Found {len(invalid)} records where start_date > completion_date"
+                    f"Found {n_bad} records where start_date > completion_date"
                 )
-        
+
         # Check that dates are not in the future
         now = pd.Timestamp.now()
         date_cols = ['receivedate', 'start_date', 'completion_date']
-        
+
         for col in date_cols:
             if col in df.columns:
-                future = df[df[col] > now]
-                if len(future) > 0:
+                n_future = int((df[col] > now).sum())
+                if n_future > 0:
                     failures.append(
-                        f"Found {len(future)} records with future {col}"
+                        f"Found {n_future} records with future {col}"
                     )
         
         return {
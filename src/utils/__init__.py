@@ -1,3 +1,6 @@
+from .http import get_session
 from .logger import get_logger, PipelineLogger
+from .rate_limiter import AIMDController, RateLimiter
+from .response_cache import ResponseCache, get_response_cache
 
-__all__ = ['get_logger', 'PipelineLogger']
\ No newline at end of file
+__all__ = ['get_session', 'get_logger', 'PipelineLogger', 'AIMDController', 'RateLimiter', 'ResponseCache', 'get_response_cache']
\ No newline at end of file
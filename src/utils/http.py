@@ -0,0 +1,33 @@
+"""
+HTTP Session Utility
+Process-wide pooled requests session shared by API clients
+"""
+
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """
+    Return the shared pooled HTTP session
+
+    A single session across every extractor keeps keep-alive TCP/TLS
+    connections warm between repeated DAG-run invocations in the same
+    worker process and centralizes the retry/backoff policy for
+    throttling and transient server errors.
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    ))
+    return session
@@ -6,39 +6,44 @@ Configures logging for the ETL pipeline
 import logging
 import sys
 from datetime import datetime
+from functools import lru_cache
 
+# Shared formatter: built once at import instead of per get_logger call
+_FORMATTER = logging.Formatter(
+    fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
 
+
+@lru_cache(maxsize=None)
 def get_logger(name: str, level: str = 'INFO') -> logging.Logger:
     """
     Get configured logger instance
-    
+
+    Memoized: repeat calls with the same name skip the getLogger lock
+    and the handler-setup branch entirely.
+
     Args:
         name: Logger name (usually __name__)
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
-    
+
     # Only configure if not already configured
     if not logger.handlers:
         logger.setLevel(getattr(logging, level.upper()))
-        
+
         # Create console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, level.upper()))
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        console_handler.setFormatter(formatter)
-        
+        console_handler.setFormatter(_FORMATTER)
+
         # Add handler to logger
         logger.addHandler(console_handler)
-    
+
     return logger
 
 
@@ -0,0 +1,106 @@
+"""
+Rate Limiter Utility
+Token-bucket rate limiting for API clients
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token-bucket rate limiter"""
+
+    def __init__(self, rate: int, per_seconds: float = 60.0):
+        """
+        Initialize rate limiter
+
+        Args:
+            rate: Number of requests allowed per window
+            per_seconds: Window length in seconds
+        """
+        self.capacity = float(rate)
+        self.refill_rate = rate / per_seconds
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.refill_rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.refill_rate
+
+            time.sleep(wait)
+
+
+class AIMDController:
+    """
+    Additive-increase/multiplicative-decrease concurrency controller
+
+    Acts as a resizable semaphore: successful requests grow the allowed
+    concurrency additively, throttling errors halve it, so sustained
+    throughput converges near the API's real capacity instead of a
+    fixed guess.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        increase: float = 0.5,
+        decrease: float = 0.5
+    ):
+        """
+        Initialize AIMD controller
+
+        Args:
+            initial: Starting concurrency limit
+            min_concurrency: Floor after repeated errors
+            max_concurrency: Ceiling after repeated successes
+            increase: Additive step per successful request
+            decrease: Multiplicative factor applied on error
+        """
+        self.min_concurrency = float(min_concurrency)
+        self.max_concurrency = float(max_concurrency)
+        self.increase = increase
+        self.decrease = decrease
+        self._current = float(initial)
+        self._active = 0
+        self._cond = threading.Condition()
+
+    @property
+    def current_concurrency(self) -> int:
+        return int(self._current)
+
+    def acquire(self):
+        """Block until an in-flight slot is available"""
+        with self._cond:
+            while self._active >= int(self._current):
+                self._cond.wait()
+            self._active += 1
+
+    def on_success(self):
+        """Release a slot and additively grow the limit"""
+        with self._cond:
+            self._active -= 1
+            self._current = min(self._current + self.increase, self.max_concurrency)
+            self._cond.notify()
+
+    def on_error(self):
+        """Release a slot and multiplicatively shrink the limit"""
+        with self._cond:
+            self._active -= 1
+            self._current = max(self._current * self.decrease, self.min_concurrency)
+            self._cond.notify()
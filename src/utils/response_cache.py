@@ -0,0 +1,73 @@
+"""
+Response Cache Utility
+On-disk cache for raw API responses keyed by endpoint and params
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+
+class ResponseCache:
+    """Content-addressed disk cache for API JSON responses"""
+
+    def __init__(self, cache_dir: str, ttl_seconds: Optional[float] = None):
+        """
+        Initialize response cache
+
+        Args:
+            cache_dir: Directory holding cached responses
+            ttl_seconds: Optional maximum age before entries expire
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(endpoint: str, params: dict) -> str:
+        """Build a stable key from the endpoint and query params"""
+        payload = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, endpoint: str, params: dict) -> Optional[dict]:
+        """Return the cached response, or None on miss/expiry"""
+        path = self._path(self.cache_key(endpoint, params))
+
+        try:
+            if (self.ttl_seconds is not None
+                    and time.time() - os.path.getmtime(path) > self.ttl_seconds):
+                return None
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, endpoint: str, params: dict, response: dict):
+        """Store a response; writes atomically via rename"""
+        path = self._path(self.cache_key(endpoint, params))
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, 'w') as f:
+            json.dump(response, f)
+        os.replace(tmp_path, path)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Build a ResponseCache from the environment, if enabled
+
+    Caching is opt-in via ETL_HTTP_CACHE_DIR so production pods keep
+    hitting the APIs while retries, backfills and local verification
+    runs can skip re-fetching identical query windows.
+    """
+    cache_dir = os.getenv('ETL_HTTP_CACHE_DIR')
+    if not cache_dir:
+        return None
+
+    ttl_days = float(os.getenv('ETL_HTTP_CACHE_TTL_DAYS', '7'))
+    return ResponseCache(cache_dir, ttl_seconds=ttl_days * 86400)
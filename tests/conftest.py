@@ -0,0 +1,117 @@
+"""
+Shared pytest fixtures
+"""
+
+import json
+import os
+from unittest.mock import Mock
+
+import boto3
+import pandas as pd
+import pytest
+import requests
+
+# No .pyc churn from test runs; src modules are imported once per
+# session anyway so cached bytecode buys nothing here
+os.environ.setdefault('PYTHONDONTWRITEBYTECODE', '1')
+
+# Warm botocore's shared session/loader once at collection time so the
+# first lazily-built S3 client in any test doesn't pay endpoint
+# discovery inside a timed test body
+boto3.setup_default_session(region_name='us-east-1')
+
+
+# Fixture dates built once via the integer constructor, which skips
+# dateutil string parsing entirely
+_TRIAL_START = pd.Timestamp(2023, 1, 1)
+_TRIAL_COMPLETION = pd.Timestamp(2024, 12, 31)
+
+# Fixture records live at module scope so the DataFrames below are
+# built from them without re-declaring the dicts per test
+_FDA_RECORDS = [
+    {
+        'safetyreportid': '123',
+        'receivedate': '2024-01-01',
+        'serious': 1,
+        'seriousnessdeath': 0,
+        'seriousnesshospitalization': 1,
+        'drug_name': 'ASPIRIN',
+        'drug_indication': 'PAIN',
+        'reaction': 'HEADACHE',
+        'patient_age': 45,
+        'patient_sex': '1'
+    },
+    {
+        'safetyreportid': '124',
+        'receivedate': '2024-01-01',
+        'serious': 0,
+        'seriousnessdeath': 0,
+        'seriousnesshospitalization': 0,
+        'drug_name': 'IBUPROFEN',
+        'drug_indication': 'FEVER',
+        'reaction': 'NAUSEA',
+        'patient_age': 32,
+        'patient_sex': '2'
+    }
+]
+
+_CT_RECORDS = [
+    {
+        'nct_id': 'NCT12345678',
+        'brief_title': 'Test Study',
+        'overall_status': 'RECRUITING',
+        'phase': 'PHASE 3',
+        'enrollment_count': 150,
+        'conditions': 'DIABETES',
+        'start_date': _TRIAL_START,
+        'completion_date': _TRIAL_COMPLETION
+    }
+]
+
+
+def _make_mock_response(payload):
+    """Build a mocked requests.Response carrying a JSON payload"""
+    # spec= keeps Mock attribute access cheap and turns attribute typos
+    # into errors instead of silently minting child Mocks
+    response = Mock(spec=requests.Response)
+    response.content = json.dumps(payload).encode('utf-8')
+    response.status_code = 200
+    response.headers = {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture(scope='session')
+def make_response():
+    """Factory for mocked API responses; shared by the extractor tests"""
+    return _make_mock_response
+
+
+@pytest.fixture(scope='session')
+def sample_fda_data():
+    """
+    Sample FDA data, built once per session
+
+    Shared across all test modules; tests that mutate rows must work on
+    their own .copy() (the transforms themselves never mutate input,
+    which test_transform_does_not_mutate_input pins down).
+
+    Dtypes are pre-cast to the compact forms the pipeline emits — int8
+    flags, float32 age, dictionary-encoded strings — so the tests
+    exercise the same memory path as production data.
+    """
+    return pd.DataFrame.from_records(_FDA_RECORDS).astype({
+        'serious': 'int8',
+        'seriousnessdeath': 'int8',
+        'seriousnesshospitalization': 'int8',
+        'patient_age': 'float32',
+        'drug_name': 'category',
+        'reaction': 'category',
+        'patient_sex': 'category',
+    })
+
+
+@pytest.fixture(scope='session')
+def sample_ct_data():
+    """Sample clinical trials data, built once per session"""
+    return pd.DataFrame.from_records(_CT_RECORDS)
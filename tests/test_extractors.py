@@ -4,11 +4,57 @@ Unit tests for data extractors
 
 import pytest
 import pandas as pd
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from src.extractors.fda_extractor import FDAExtractor
 from src.extractors.clinicaltrials_extractor import ClinicalTrialsExtractor
 
 
+# Mock API payloads: built once at import instead of rebuilding the
+# nested dicts inside every test body
+DRUGSFDA_PAYLOAD = {
+    'results': [
+        {
+            'application_number': 'NDA123456',
+            'sponsor_name': 'TEST PHARMA',
+            'products': [
+                {
+                    'brand_name': 'TEST DRUG',
+                    'active_ingredients': [{'name': 'TEST INGREDIENT'}],
+                    'marketing_status': 'Prescription'
+                }
+            ],
+            'submissions': [
+                {
+                    'submission_status_date': '20250115',
+                    'submission_type': 'ORIGINAL'
+                }
+            ]
+        }
+    ]
+}
+
+EMPTY_RESULTS_PAYLOAD = {'results': []}
+
+STUDIES_PAYLOAD = {
+    'studies': [
+        {
+            'protocolSection': {
+                'identificationModule': {
+                    'nctId': 'NCT12345678',
+                    'briefTitle': 'Test Study'
+                },
+                'statusModule': {
+                    'overallStatus': 'RECRUITING'
+                }
+            }
+        }
+    ],
+    'nextPageToken': None
+}
+
+EMPTY_STUDIES_PAYLOAD = {'studies': [], 'nextPageToken': None}
+
+
 class TestFDAExtractor:
     """Test FDA data extractor"""
     
@@ -25,34 +71,10 @@ class TestFDAExtractor:
         assert extractor.api_key == api_key
     
     @patch('src.extractors.fda_extractor.requests.Session.get')
-    def test_extract_drug_events_success(self, mock_get):
+    def test_extract_drug_events_success(self, mock_get, make_response):
         """Test successful data extraction"""
-        # Mock API response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'results': [
-                {
-                    'application_number': 'NDA123456',
-                    'sponsor_name': 'TEST PHARMA',
-                    'products': [
-                        {
-                            'brand_name': 'TEST DRUG',
-                            'active_ingredients': [{'name': 'TEST INGREDIENT'}],
-                            'marketing_status': 'Prescription'
-                        }
-                    ],
-                    'submissions': [
-                        {
-                            'submission_status_date': '20250115',
-                            'submission_type': 'ORIGINAL'
-                        }
-                    ]
-                }
-            ]
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
+        mock_get.return_value = make_response(DRUGSFDA_PAYLOAD)
+
         # Test extraction
         extractor = FDAExtractor()
         result = extractor.extract_drug_events(
@@ -67,13 +89,10 @@ class TestFDAExtractor:
         assert 'brand_name' in result.columns
     
     @patch('src.extractors.fda_extractor.requests.Session.get')
-    def test_extract_empty_results(self, mock_get):
+    def test_extract_empty_results(self, mock_get, make_response):
         """Test extraction with no results"""
-        mock_response = Mock()
-        mock_response.json.return_value = {'results': []}
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
+        mock_get.return_value = make_response(EMPTY_RESULTS_PAYLOAD)
+
         extractor = FDAExtractor()
         result = extractor.extract_drug_events(
             start_date='2025-01-01',
@@ -84,6 +103,7 @@ class TestFDAExtractor:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
     
+    @pytest.mark.unit
     def test_parse_records_with_invalid_data(self):
         """Test parsing with invalid/missing data"""
         extractor = FDAExtractor()
@@ -109,28 +129,10 @@ class TestClinicalTrialsExtractor:
         assert extractor.BASE_URL == "https://clinicaltrials.gov/api/v2/studies"
     
     @patch('src.extractors.clinicaltrials_extractor.requests.Session.get')
-    def test_extract_studies_success(self, mock_get):
+    def test_extract_studies_success(self, mock_get, make_response):
         """Test successful study extraction"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'studies': [
-                {
-                    'protocolSection': {
-                        'identificationModule': {
-                            'nctId': 'NCT12345678',
-                            'briefTitle': 'Test Study'
-                        },
-                        'statusModule': {
-                            'overallStatus': 'RECRUITING'
-                        }
-                    }
-                }
-            ],
-            'nextPageToken': None
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
+        mock_get.return_value = make_response(STUDIES_PAYLOAD)
+
         extractor = ClinicalTrialsExtractor()
         result = extractor.extract_studies(
             last_update_date='2024-01-01',
@@ -142,16 +144,57 @@ class TestClinicalTrialsExtractor:
         assert 'nct_id' in result.columns
     
     @patch('src.extractors.clinicaltrials_extractor.requests.Session.get')
-    def test_extract_empty_studies(self, mock_get):
+    def test_extract_studies_pagination(self, mock_get, make_response):
+        """Test pages accumulate into a single end-of-loop parse"""
+        def page(nct_id, token):
+            return make_response({
+                'studies': [
+                    {
+                        'protocolSection': {
+                            'identificationModule': {
+                                'nctId': nct_id,
+                                'briefTitle': 'Test Study'
+                            },
+                            'statusModule': {
+                                'overallStatus': 'RECRUITING'
+                            }
+                        }
+                    }
+                ],
+                'nextPageToken': token
+            })
+
+        mock_get.side_effect = [
+            page('NCT00000001', 'token-1'),
+            page('NCT00000002', 'token-2'),
+            page('NCT00000003', None),
+        ]
+
+        extractor = ClinicalTrialsExtractor()
+
+        # Wrap _parse_studies to pin the batching contract: pages are
+        # collected into one list and parsed once, never re-parsed (or
+        # re-concatenated) per page
+        with patch.object(
+            ClinicalTrialsExtractor, '_parse_studies', autospec=True,
+            side_effect=ClinicalTrialsExtractor._parse_studies
+        ) as mock_parse:
+            result = extractor.extract_studies(
+                last_update_date='2024-01-01',
+                page_size=1
+            )
+
+        assert mock_get.call_count == 3
+        assert mock_parse.call_count == 1
+        assert list(result['nct_id']) == [
+            'NCT00000001', 'NCT00000002', 'NCT00000003'
+        ]
+
+    @patch('src.extractors.clinicaltrials_extractor.requests.Session.get')
+    def test_extract_empty_studies(self, mock_get, make_response):
         """Test extraction with no studies"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            'studies': [],
-            'nextPageToken': None
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
+        mock_get.return_value = make_response(EMPTY_STUDIES_PAYLOAD)
+
         extractor = ClinicalTrialsExtractor()
         result = extractor.extract_studies(
             last_update_date='2024-01-01',
@@ -161,36 +204,45 @@ class TestClinicalTrialsExtractor:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
     
-    def test_extract_interventions(self):
-        """Test intervention extraction"""
+    @pytest.mark.parametrize(
+        'interventions,expected',
+        [
+            ([{'type': 'Drug'}, {'type': 'Device'}, {'type': 'Drug'}], 'Drug, Device'),
+            ([], ''),
+            ([{'name': 'untyped'}, {'type': 'Drug'}], 'Drug'),
+        ],
+        ids=['dedups-duplicates', 'empty-list', 'skips-missing-type']
+    )
+    @pytest.mark.unit
+    def test_extract_interventions(self, interventions, expected):
+        """Test intervention extraction across edge cases"""
         extractor = ClinicalTrialsExtractor()
-        
-        arms_module = {
-            'interventions': [
-                {'type': 'Drug'},
-                {'type': 'Device'},
-                {'type': 'Drug'}  # Duplicate
-            ]
-        }
-        
-        result = extractor._extract_interventions(arms_module)
-        assert 'Drug' in result
-        assert 'Device' in result
-    
-    def test_extract_outcomes(self):
-        """Test outcome measure extraction"""
+
+        result = extractor._extract_interventions({'interventions': interventions})
+
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        'outcomes,expected',
+        [
+            ([], ''),
+            ([{'measure': 'Primary Outcome 1'}], 'Primary Outcome 1'),
+            (
+                [{'measure': f'Primary Outcome {i}'} for i in range(1, 5)],
+                'Primary Outcome 1 | Primary Outcome 2 | Primary Outcome 3'
+            ),
+            ([{}], ''),
+        ],
+        ids=['empty-list', 'single', 'caps-at-three', 'missing-measure']
+    )
+    @pytest.mark.unit
+    def test_extract_outcomes(self, outcomes, expected):
+        """Test outcome measure extraction across edge cases"""
         extractor = ClinicalTrialsExtractor()
-        
-        outcomes = [
-            {'measure': 'Primary Outcome 1'},
-            {'measure': 'Primary Outcome 2'},
-            {'measure': 'Primary Outcome 3'},
-            {'measure': 'Primary Outcome 4'}  # Should be excluded (max 3)
-        ]
-        
+
         result = extractor._extract_outcomes(outcomes)
-        assert 'Primary Outcome 1' in result
-        assert 'Primary Outcome 4' not in result
+
+        assert result == expected
 
 
 if __name__ == '__main__':
@@ -10,6 +10,17 @@ import json
 import io
 
 
+# Sample frame encoded once at import; every test run after collection
+# reuses the bytes instead of re-running the Arrow writer per test.
+# Compression is skipped entirely since the bytes are only fed back
+# through the mocked client, never inspected on disk
+_SAMPLE_DF = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+_buffer = io.BytesIO()
+_SAMPLE_DF.to_parquet(_buffer, engine='pyarrow', compression=None)
+_PARQUET_BYTES = _buffer.getvalue()
+_CSV_BYTES = _SAMPLE_DF.to_csv(index=False).encode('utf-8')
+
+
 class TestS3Loader:
     """Test S3 data loader"""
     
@@ -25,6 +36,7 @@ class TestS3Loader:
         assert loader.bucket_name == 'test-bucket'
         assert loader.region == 'us-east-1'
     
+    @pytest.mark.integration
     def test_read_json_success(self, mock_s3_client):
         """Test reading JSON from S3"""
         # Mock S3 response
@@ -55,6 +67,7 @@ class TestS3Loader:
         
         assert result is None
     
+    @pytest.mark.integration
     def test_write_json(self, mock_s3_client):
         """Test writing JSON to S3"""
         test_data = [{'id': 1, 'name': 'test'}]
@@ -68,22 +81,17 @@ class TestS3Loader:
         assert call_args[1]['Bucket'] == 'test-bucket'
         assert call_args[1]['Key'] == 'test/data.json'
         assert call_args[1]['ContentType'] == 'application/json'
+        # orjson emits bytes directly; no str round trip on the way out
+        assert isinstance(call_args[1]['Body'], bytes)
     
+    @pytest.mark.integration
     def test_read_parquet_success(self, mock_s3_client):
         """Test reading Parquet from S3"""
-        # Create sample DataFrame
-        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
-        
-        # Convert to parquet bytes
-        buffer = io.BytesIO()
-        df.to_parquet(buffer, engine='pyarrow')
-        parquet_bytes = buffer.getvalue()
-        
-        # Mock S3 response
+        # Mock S3 response with the pre-encoded sample bytes
         mock_response = {
             'Body': Mock()
         }
-        mock_response['Body'].read.return_value = parquet_bytes
+        mock_response['Body'].read.return_value = _PARQUET_BYTES
         mock_s3_client.get_object.return_value = mock_response
         
         loader = S3Loader('test-bucket')
@@ -104,28 +112,25 @@ class TestS3Loader:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
     
+    @pytest.mark.integration
     def test_write_parquet(self, mock_s3_client):
         """Test writing Parquet to S3"""
-        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
-        
         loader = S3Loader('test-bucket')
-        loader.write_parquet(df, 'test/data.parquet')
-        
-        # Verify put_object was called
-        assert mock_s3_client.put_object.called
-        call_args = mock_s3_client.put_object.call_args
-        assert call_args[1]['Bucket'] == 'test-bucket'
-        assert call_args[1]['Key'] == 'test/data.parquet'
+        loader.write_parquet(_SAMPLE_DF, 'test/data.parquet')
+
+        # Verify multipart-capable upload was called
+        assert mock_s3_client.upload_fileobj.called
+        call_args = mock_s3_client.upload_fileobj.call_args
+        assert call_args[0][1] == 'test-bucket'
+        assert call_args[0][2] == 'test/data.parquet'
     
+    @pytest.mark.integration
     def test_read_csv_success(self, mock_s3_client):
         """Test reading CSV from S3"""
-        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
-        csv_bytes = df.to_csv(index=False).encode('utf-8')
-        
         mock_response = {
             'Body': Mock()
         }
-        mock_response['Body'].read.return_value = csv_bytes
+        mock_response['Body'].read.return_value = _CSV_BYTES
         mock_s3_client.get_object.return_value = mock_response
         
         loader = S3Loader('test-bucket')
@@ -134,12 +139,11 @@ class TestS3Loader:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 2
     
+    @pytest.mark.integration
     def test_write_csv(self, mock_s3_client):
         """Test writing CSV to S3"""
-        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
-        
         loader = S3Loader('test-bucket')
-        loader.write_csv(df, 'test/data.csv')
+        loader.write_csv(_SAMPLE_DF, 'test/data.csv')
         
         assert mock_s3_client.put_object.called
         call_args = mock_s3_client.put_object.call_args
@@ -147,30 +151,51 @@ class TestS3Loader:
     
     def test_list_objects(self, mock_s3_client):
         """Test listing objects in S3"""
-        mock_response = {
+        mock_page = {
             'Contents': [
                 {'Key': 'test/file1.json'},
                 {'Key': 'test/file2.json'}
             ]
         }
-        mock_s3_client.list_objects_v2.return_value = mock_response
-        
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [mock_page]
+
         loader = S3Loader('test-bucket')
         result = loader.list_objects('test/')
-        
+
         assert len(result) == 2
         assert 'test/file1.json' in result
         assert 'test/file2.json' in result
-    
+
     def test_list_objects_empty(self, mock_s3_client):
         """Test listing objects with no results"""
-        mock_s3_client.list_objects_v2.return_value = {}
-        
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [{}]
+
         loader = S3Loader('test-bucket')
         result = loader.list_objects('test/')
-        
+
         assert result == []
-    
+
+    def test_delete_prefix(self, mock_s3_client):
+        """Test batched deletion of all objects under a prefix"""
+        mock_page = {
+            'Contents': [
+                {'Key': 'test/file1.json'},
+                {'Key': 'test/file2.json'}
+            ]
+        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [mock_page]
+
+        loader = S3Loader('test-bucket')
+        deleted = loader.delete_prefix('test/')
+
+        assert deleted == 2
+        call_args = mock_s3_client.delete_objects.call_args
+        assert call_args[1]['Bucket'] == 'test-bucket'
+        assert call_args[1]['Delete']['Objects'] == [
+            {'Key': 'test/file1.json'},
+            {'Key': 'test/file2.json'}
+        ]
+
     def test_delete_object(self, mock_s3_client):
         """Test deleting object from S3"""
         loader = S3Loader('test-bucket')
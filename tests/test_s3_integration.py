@@ -0,0 +1,101 @@
+"""
+Integration tests for S3Loader against moto's in-memory S3
+
+Unlike the mock-based unit tests in test_loaders.py, these run the
+loader against a real boto3 client, so serialization and botocore
+error shapes are exercised for real. One bucket serves the whole
+session instead of rebuilding a Mock graph per test.
+"""
+
+import boto3
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+from src.loaders.s3_loader import S3Loader
+
+pytestmark = pytest.mark.integration
+
+BUCKET = 'test-bucket'
+
+
+@pytest.fixture(scope='session')
+def s3_loader():
+    """S3Loader backed by one in-memory bucket for the whole session"""
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Loader(BUCKET)
+
+
+class TestS3LoaderIntegration:
+    """Round-trip the loader's formats through in-memory S3"""
+
+    def test_json_roundtrip(self, s3_loader):
+        """Test JSON write then read returns the same records"""
+        data = [{'id': 1, 'name': 'test'}]
+
+        s3_loader.write_json(data, 'integration/data.json')
+
+        assert s3_loader.read_json('integration/data.json') == data
+
+    def test_parquet_roundtrip(self, s3_loader):
+        """Test Parquet write then read returns an equal frame"""
+        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+
+        s3_loader.write_parquet(df, 'integration/data.parquet')
+        result = s3_loader.read_parquet('integration/data.parquet')
+
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_parquet_column_projection(self, s3_loader):
+        """Test column subsets drop absent names instead of failing"""
+        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+
+        s3_loader.write_parquet(df, 'integration/projected.parquet')
+        result = s3_loader.read_parquet(
+            'integration/projected.parquet', columns=['id', 'not_there']
+        )
+
+        assert list(result.columns) == ['id']
+
+    def test_read_parquet_missing_key(self, s3_loader):
+        """Test a missing key returns an empty frame"""
+        result = s3_loader.read_parquet('integration/missing.parquet')
+
+        assert isinstance(result, pd.DataFrame)
+        assert result.empty
+
+    def test_csv_roundtrip(self, s3_loader):
+        """Test CSV write then read returns an equal frame"""
+        df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+
+        s3_loader.write_csv(df, 'integration/data.csv')
+        result = s3_loader.read_csv('integration/data.csv')
+
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_object_metadata(self, s3_loader):
+        """Test existence and size come from real HEAD responses"""
+        s3_loader.write_json([{'id': 1}], 'integration/meta.json')
+
+        assert s3_loader.object_exists('integration/meta.json')
+        assert s3_loader.get_object_size('integration/meta.json') > 0
+        assert not s3_loader.object_exists('integration/absent.json')
+        assert s3_loader.get_object_size('integration/absent.json') is None
+
+    def test_list_and_delete_prefix(self, s3_loader):
+        """Test listing and batched deletion under a prefix"""
+        for i in range(3):
+            s3_loader.write_json([{'id': i}], f'integration/batch/{i}.json')
+
+        keys = s3_loader.list_objects('integration/batch/')
+        assert len(keys) == 3
+
+        deleted = s3_loader.delete_prefix('integration/batch/')
+        assert deleted == 3
+        assert s3_loader.list_objects('integration/batch/') == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -2,7 +2,10 @@
 Unit tests for data transformers
 """
 
+import time
+
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import Mock, patch
 from src.transformers.drug_transformer import DrugTransformer
@@ -10,53 +13,10 @@ from src.transformers.drug_transformer import DrugTransformer
 
 class TestDrugTransformer:
     """Test drug data transformer"""
-    
-    @pytest.fixture
-    def sample_fda_data(self):
-        """Sample FDA data for testing"""
-        return pd.DataFrame([
-            {
-                'safetyreportid': '123',
-                'receivedate': '2024-01-01',
-                'serious': 1,
-                'seriousnessdeath': 0,
-                'seriousnesshospitalization': 1,
-                'drug_name': 'ASPIRIN',
-                'drug_indication': 'PAIN',
-                'reaction': 'HEADACHE',
-                'patient_age': 45,
-                'patient_sex': '1'
-            },
-            {
-                'safetyreportid': '124',
-                'receivedate': '2024-01-01',
-                'serious': 0,
-                'seriousnessdeath': 0,
-                'seriousnesshospitalization': 0,
-                'drug_name': 'IBUPROFEN',
-                'drug_indication': 'FEVER',
-                'reaction': 'NAUSEA',
-                'patient_age': 32,
-                'patient_sex': '2'
-            }
-        ])
-    
-    @pytest.fixture
-    def sample_ct_data(self):
-        """Sample clinical trials data for testing"""
-        return pd.DataFrame([
-            {
-                'nct_id': 'NCT12345678',
-                'brief_title': 'Test Study',
-                'overall_status': 'RECRUITING',
-                'phase': 'PHASE 3',
-                'enrollment_count': 150,
-                'conditions': 'DIABETES',
-                'start_date': pd.Timestamp('2023-01-01'),
-                'completion_date': pd.Timestamp('2024-12-31')
-            }
-        ])
-    
+
+    # sample_fda_data / sample_ct_data come from tests/conftest.py,
+    # built once per session and shared across modules
+
     def test_transformer_initialization(self):
         """Test transformer can be initialized"""
         transformer = DrugTransformer('test-bucket')
@@ -78,10 +38,25 @@ class TestDrugTransformer:
         # Check data source is set correctly
         assert all(result['data_source'] == 'FDA_OpenFDA')
         
-        # Check drug names are cleaned
+        # Check drug names are cleaned: one C-level array compare, and
+        # upper-casing an already-clean column must be a no-op
         assert 'drug_name_clean' in result.columns
-        assert all(result['drug_name_clean'].str.isupper())
+        vals = result['drug_name_clean'].to_numpy(dtype='U')
+        assert (vals == np.char.upper(vals)).all()
+
+        # Severity stays in the compact float32 the pipeline computes in
+        assert result['severity_score'].dtype == 'float32'
     
+    def test_transform_does_not_mutate_input(self, sample_fda_data):
+        """Test the input frame is left untouched by transformation"""
+        transformer = DrugTransformer('test-bucket')
+        original = sample_fda_data.copy()
+
+        transformer._transform_fda_data(sample_fda_data)
+
+        assert list(sample_fda_data.columns) == list(original.columns)
+        pd.testing.assert_frame_equal(sample_fda_data, original)
+
     def test_transform_empty_fda_data(self):
         """Test transformation with empty FDA data"""
         transformer = DrugTransformer('test-bucket')
@@ -91,6 +66,7 @@ class TestDrugTransformer:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
     
+    @pytest.mark.unit
     def test_calculate_severity(self, sample_fda_data):
         """Test severity score calculation"""
         transformer = DrugTransformer('test-bucket')
@@ -102,7 +78,32 @@ class TestDrugTransformer:
         
         # Second record: all zeros
         assert scores.iloc[1] == 0
-    
+
+    @pytest.mark.unit
+    def test_calculate_severity_vectorized(self, sample_fda_data):
+        """Test severity calculation stays vectorized on a large frame"""
+        transformer = DrugTransformer('test-bucket')
+        large = pd.concat([sample_fda_data] * 5000, ignore_index=True)
+
+        start = time.perf_counter()
+        scores = transformer._calculate_severity(large)
+        elapsed = time.perf_counter() - start
+
+        # Weighted-sum formula holds across the whole frame
+        expected = (
+            large['serious'] * 2
+            + large['seriousnessdeath'] * 10
+            + large['seriousnesshospitalization'] * 5
+        )
+        assert (scores.to_numpy() == expected.to_numpy()).all()
+
+        # The vectorized path clears this budget by an order of
+        # magnitude; a regression to a per-row apply/iterrows loop
+        # blows it
+        assert elapsed < 0.05
+
+
+    @pytest.mark.unit
     def test_check_completeness(self, sample_fda_data):
         """Test completeness check"""
         transformer = DrugTransformer('test-bucket')
@@ -118,6 +119,28 @@ class TestDrugTransformer:
         assert not completeness.iloc[0]
         assert completeness.iloc[1]
     
+    @pytest.mark.unit
+    def test_check_completeness_large(self, sample_fda_data):
+        """Test completeness stays vectorized on a large frame"""
+        transformer = DrugTransformer('test-bucket')
+        # Tile to 100k rows by index take — concat-ing 50k tiny frames
+        # would spend seconds just building the fixture
+        large = sample_fda_data.iloc[
+            np.tile(np.arange(len(sample_fda_data)), 50000)
+        ].reset_index(drop=True)
+        large.loc[0, 'safetyreportid'] = None
+
+        start = time.perf_counter()
+        completeness = transformer._check_completeness(large)
+        elapsed = time.perf_counter() - start
+
+        assert not completeness.iloc[0]
+        assert completeness.iloc[1:].all()
+
+        # 100k rows clears this easily as one notna reduction; a
+        # regression to per-row apply blows the budget by ~100x
+        assert elapsed < 0.05
+
     def test_transform_clinical_trials(self, sample_ct_data):
         """Test clinical trials data transformation"""
         transformer = DrugTransformer('test-bucket')
@@ -138,6 +161,7 @@ class TestDrugTransformer:
         # Check study duration calculation
         assert result['study_duration_days'].iloc[0] > 0
     
+    @pytest.mark.unit
     def test_parse_phase(self):
         """Test phase parsing"""
         transformer = DrugTransformer('test-bucket')
@@ -1,78 +1,155 @@
+"""
+Enrichment verification cases
 
-import pandas as pd
-import sys
-import os
+On hosts with a GPU and cudf installed, large case matrices can run the
+enrichment's merge/groupby/str work on the GPU with zero code changes:
+
+    python -m cudf.pandas -m pytest verify_enrichment.py
 
-# Add src to path
-sys.path.append(os.getcwd())
+The cudf.pandas proxy intercepts the pandas import and routes supported
+ops to cuDF, falling back to CPU otherwise. _enrich_data deliberately
+sticks to merge/groupby/str kernels (no Python .apply), which keeps it
+on that fast path.
+"""
+
+import pandas as pd
+import pytest
 
 from src.transformers.drug_transformer import DrugTransformer
 
-def test_enrichment():
-    print("Testing enrichment logic...")
-    
-    # Mock transformer (we only need the _enrich_data method)
-    transformer = DrugTransformer('test-bucket')
-    
-    # Test case 1: Exact match
-    fda_df = pd.DataFrame([
-        {
-            'drug_name_clean': 'DRUG A',
-            'drug_indication': 'Headache',
-            'safetyreportid': '1',
-            'severity_score': 10,
-            'seriousnessdeath': 0,
-            'seriousnesshospitalization': 0
-        }
-    ])
-    
-    ct_df = pd.DataFrame([
-        {
-            'conditions_clean': 'HEADACHE',
-            'nct_id': 'NCT1',
-            'enrollment_count': 100,
-            'is_completed': 1
-        }
-    ])
-    
-    result = transformer._enrich_data(fda_df, ct_df)
-    
-    if len(result) == 1 and result.iloc[0]['trial_count'] == 1:
-        print("PASS: Exact match")
-    else:
-        print(f"FAIL: Exact match. Result: {result}")
-
-    # Test case 2: Partial match
-    fda_df = pd.DataFrame([
-        {
-            'drug_name_clean': 'DRUG C',
-            'drug_indication': 'Lung Cancer',
-            'safetyreportid': '3',
-            'severity_score': 30,
-            'seriousnessdeath': 1,
-            'seriousnesshospitalization': 0
-        }
-    ])
-    
-    ct_df = pd.DataFrame([
-        {
-            'conditions_clean': 'NON-SMALL CELL LUNG CANCER',
-            'nct_id': 'NCT3',
-            'enrollment_count': 300,
-            'is_completed': 1
-        }
-    ])
-    
-    result = transformer._enrich_data(fda_df, ct_df)
-    
-    if len(result) == 1 and result.iloc[0]['trial_count'] == 1:
-        print("PASS: Partial match")
-    else:
-        print(f"FAIL: Partial match. Result: {result}")
+
+@pytest.fixture(scope='module')
+def transformer():
+    """One transformer for every case; only _enrich_data is exercised"""
+    return DrugTransformer('test-bucket')
+
+
+# Memoized enrichment: repeat cases with identical frames skip the
+# whole match pipeline. Content-hashing only pays off once the inputs
+# are big enough that enrichment dwarfs the hash, so tiny frames call
+# straight through
+_MEMO_MIN_ROWS = 100
+_enrich_cache = {}
+
+
+def _enrich(transformer, fda_df, ct_df):
+    if len(fda_df) + len(ct_df) < _MEMO_MIN_ROWS:
+        return transformer._enrich_data(fda_df, ct_df)
+
+    key = (
+        pd.util.hash_pandas_object(fda_df).values.tobytes(),
+        pd.util.hash_pandas_object(ct_df).values.tobytes()
+    )
+    if key not in _enrich_cache:
+        _enrich_cache[key] = transformer._enrich_data(fda_df, ct_df)
+    return _enrich_cache[key]
+
+
+# Case frames built once at import with the pipeline's compact dtypes;
+# pd.DataFrame from list-of-dicts re-infers dtypes on every call, so
+# the parametrize table references these instead of inline literals
+_FDA_DTYPES = {
+    'severity_score': 'float32',
+    'seriousnessdeath': 'int8',
+    'seriousnesshospitalization': 'int8',
+}
+_CT_DTYPES = {'enrollment_count': 'int32', 'is_completed': 'int8'}
+
+FDA_CASES = {
+    'exact-match': pd.DataFrame([{
+        'drug_name_clean': 'DRUG A',
+        'drug_indication': 'Headache',
+        'safetyreportid': '1',
+        'severity_score': 10,
+        'seriousnessdeath': 0,
+        'seriousnesshospitalization': 0
+    }]).astype(_FDA_DTYPES),
+    'partial-match': pd.DataFrame([{
+        'drug_name_clean': 'DRUG C',
+        'drug_indication': 'Lung Cancer',
+        'safetyreportid': '3',
+        'severity_score': 30,
+        'seriousnessdeath': 1,
+        'seriousnesshospitalization': 0
+    }]).astype(_FDA_DTYPES),
+}
+
+CT_CASES = {
+    'exact-match': pd.DataFrame([{
+        'conditions_clean': 'HEADACHE',
+        'nct_id': 'NCT1',
+        'enrollment_count': 100,
+        'is_completed': 1
+    }]).astype(_CT_DTYPES),
+    'partial-match': pd.DataFrame([{
+        'conditions_clean': 'NON-SMALL CELL LUNG CANCER',
+        'nct_id': 'NCT3',
+        'enrollment_count': 300,
+        'is_completed': 1
+    }]).astype(_CT_DTYPES),
+}
+
+
+@pytest.mark.parametrize(
+    'fda_df, ct_df, expected_len, expected_trial_count',
+    [
+        (FDA_CASES['exact-match'], CT_CASES['exact-match'], 1, 1),
+        (FDA_CASES['partial-match'], CT_CASES['partial-match'], 1, 1),
+    ],
+    ids=['exact-match', 'partial-match']
+)
+def test_enrichment(transformer, fda_df, ct_df, expected_len,
+                    expected_trial_count):
+    """Each case feeds one FDA/CT pair through the enrichment join"""
+    result = _enrich(transformer, fda_df, ct_df)
+
+    # One C-level frame comparison covers length and values, and prints
+    # a real diff on failure instead of a bare boolean
+    expected = pd.DataFrame({'trial_count': [expected_trial_count] * expected_len})
+    pd.testing.assert_frame_equal(
+        result[['trial_count']].reset_index(drop=True),
+        expected,
+        check_dtype=False
+    )
+
+
+def test_enrichment_empty_ct(transformer):
+    """An empty trials frame takes the fast path: FDA summary only"""
+    ct_empty = pd.DataFrame(
+        columns=['conditions_clean', 'nct_id', 'enrollment_count', 'is_completed']
+    )
+
+    result = transformer._enrich_data(FDA_CASES['exact-match'], ct_empty)
+
+    assert len(result) == 1
+    assert result.iloc[0]['adverse_event_count'] == 1
+    # No trial columns are fabricated when there are no trials to join
+    assert 'trial_count' not in result.columns
+
+
+def test_enrichment_batched(transformer):
+    """All cases stacked through one enrichment call
+
+    One pipeline over the combined frames replaces a per-case
+    invocation each, and doubles as a cross-talk check: each drug may
+    only match its own case's trial. Every case uses a distinct
+    drug_name_clean, which therefore serves as the case key in the
+    grouped output (surfaced there as drug_name).
+    """
+    fda_all = pd.concat(FDA_CASES.values(), ignore_index=True)
+    ct_all = pd.concat(CT_CASES.values(), ignore_index=True)
+
+    result = transformer._enrich_data(fda_all, ct_all)
+
+    counts = result.set_index('drug_name')['trial_count']
+    expected = pd.Series({'DRUG A': 1, 'DRUG C': 1}, name='trial_count')
+    pd.testing.assert_series_equal(
+        counts.loc[expected.index],
+        expected,
+        check_dtype=False,
+        check_names=False
+    )
+
 
 if __name__ == "__main__":
-    try:
-        test_enrichment()
-        print("Verification script finished.")
-    except Exception as e:
-        print(f"Verification failed with error: {e}")
+    raise SystemExit(pytest.main([__file__, '-v']))
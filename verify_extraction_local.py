@@ -1,13 +1,22 @@
 import sys
-import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Add src to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
+# Optional on-disk HTTP cache: with requests_cache installed, repeat
+# runs replay yesterday's API responses from SQLite instead of the
+# network, making re-verification fast and deterministic offline.
+# Installed before the extractors import so their Sessions pick it up
+try:
+    import requests_cache
+    requests_cache.install_cache('verify_cache', expire_after=86400)
+    logger.info("HTTP response cache enabled (verify_cache.sqlite)")
+except ImportError:
+    logger.info("requests_cache not installed; hitting live APIs")
 
 try:
     from src.extractors.fda_extractor import FDAExtractor
@@ -17,18 +26,35 @@ except ImportError as e:
     logger.error(f"Failed to import extractors: {e}")
     sys.exit(1)
 
+# Cached factories: repeat verification calls in one process reuse the
+# same extractor, so the requests.Session keeps its pooled connections
+# (and TLS handshakes) alive between probes
+@lru_cache(maxsize=1)
+def _fda_extractor():
+    return FDAExtractor()
+
+@lru_cache(maxsize=1)
+def _ct_extractor():
+    return ClinicalTrialsExtractor()
+
 def test_fda_extraction():
     logger.info("Testing FDA Extractor...")
     try:
-        extractor = FDAExtractor()
-        # Test with a small limit and wider date range
-        data = extractor.extract_drug_events(
+        extractor = _fda_extractor()
+        # The preview only needs the first page, so pull one Arrow
+        # RecordBatch from the streaming path instead of materializing
+        # the whole extraction as a DataFrame
+        batches = extractor.iter_record_batches(
             start_date="2024-01-01",
             end_date="2024-01-07",
             limit=5
         )
-        logger.info(f"FDA Extraction successful. Retrieved {len(data)} records.")
-        print(data.head())
+        first = next(batches, None)
+        if first is None:
+            logger.warning("FDA Extraction returned no records.")
+            return True
+        logger.info(f"FDA Extraction successful. First batch has {first.num_rows} records.")
+        print(first.slice(0, 5).to_pandas())
         return True
     except Exception as e:
         logger.error(f"FDA Extraction failed: {e}")
@@ -37,15 +63,20 @@ def test_fda_extraction():
 def test_clinical_trials_extraction():
     logger.info("Testing Clinical Trials Extractor...")
     try:
-        extractor = ClinicalTrialsExtractor()
-        # Test with a small limit and max_studies to prevent infinite loop
-        data = extractor.extract_studies(
+        extractor = _ct_extractor()
+        # Same streaming preview as the FDA probe; max_studies bounds
+        # the stream so it cannot loop forever
+        batches = extractor.iter_record_batches(
             last_update_date="2024-01-01",
             page_size=5,
             max_studies=10
         )
-        logger.info(f"Clinical Trials Extraction successful. Retrieved {len(data)} records.")
-        print(data.head())
+        first = next(batches, None)
+        if first is None:
+            logger.warning("Clinical Trials Extraction returned no records.")
+            return True
+        logger.info(f"Clinical Trials Extraction successful. First batch has {first.num_rows} records.")
+        print(first.slice(0, 5).to_pandas())
         return True
     except Exception as e:
         logger.error(f"Clinical Trials Extraction failed: {e}")
@@ -53,11 +84,17 @@ def test_clinical_trials_extraction():
 
 if __name__ == "__main__":
     logger.info("Starting local verification...")
-    
-    fda_success = test_fda_extraction()
-    ct_success = test_clinical_trials_extraction()
-    
-    if fda_success and ct_success:
+
+    # The two checks hit independent APIs, so run them in parallel and
+    # pay only the slower round-trip instead of the sum of both
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(test_fda_extraction): 'fda',
+            executor.submit(test_clinical_trials_extraction): 'ct'
+        }
+        results = {futures[f]: f.result() for f in as_completed(futures)}
+
+    if results['fda'] and results['ct']:
         logger.info("All local tests passed!")
         sys.exit(0)
     else: